@@ -1,19 +1,18 @@
 import os
-import time
-import json
+import re
+import sqlite3
 import hashlib
 import logging
 import asyncio
+from contextlib import closing
 from datetime import datetime, timedelta
+from html import escape
 from threading import Thread
 
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+import httpx
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from lxml import etree, html as lxml_html
 import telegram
 from flask import Flask
 
@@ -27,19 +26,54 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Telegram Configuration
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_SEND_INTERVAL = 1  # Seconds between messages; Telegram allows about one per second to a single chat
+TELEGRAM_MAX_SEND_ATTEMPTS = 3  # Attempts per message while Telegram keeps answering RetryAfter
+
+# Notification Outcomes; only failed notifications are left out of the cache and retried next cycle
+NOTIFICATION_SENT = "sent"
+NOTIFICATION_REJECTED = "rejected"  # Telegram refused the message itself, so resending cannot help
+NOTIFICATION_SKIPPED = "skipped"  # Telegram credentials are not configured
+NOTIFICATION_FAILED = "failed"  # Transient error such as a timeout, network error or persistent throttling
 
 # Job Filtering Configuration
 INCLUSION_KEYWORDS = ["javascript", "reactjs", "angular", "jquery", "nextjs", "vue"]
 EXCLUSION_KEYWORDS = ["associate", "senior", "mid-level", "0-5 years", "lead", "staff", "principal"]
 
 # Cache Configuration
-JOB_CACHE_FILE = "job_cache.json"
+JOB_CACHE_FILE = "job_cache.db"
 CACHE_RETENTION_HOURS = 48  # Store jobs for 48 hours
 
+# Scraping Configuration
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
 # URLs
 NAUKRI_URL = "https://www.naukri.com/frontend-developer-jobs"
 LINKEDIN_URL = "https://www.linkedin.com/jobs/search/?keywords=frontend%20developer&location=India&f_TPR=r86400" # Last 24 hours
 
+# CSS Selectors (used by the browser fallback)
+NAUKRI_CARD_SELECTOR = "article.jobTuple"
+LINKEDIN_RESULTS_SELECTOR = "ul.jobs-search__results-list"
+LINKEDIN_CARD_SELECTOR = f"{LINKEDIN_RESULTS_SELECTOR} > li"
+
+# XPath Expressions (compiled once and evaluated by libxml2)
+def has_class(name):
+    """Returns an XPath predicate matching elements whose class list contains the given class."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+NAUKRI_CARD_XPATH = etree.XPath(f"//article[{has_class('jobTuple')}]")
+NAUKRI_TITLE_XPATH = etree.XPath(f".//a[{has_class('title')}]")
+NAUKRI_COMPANY_XPATH = etree.XPath(f".//a[{has_class('subTitle')}]")
+NAUKRI_POSTED_DATE_XPATH = etree.XPath(f".//span[{has_class('postedDate')}]")
+NAUKRI_DESCRIPTION_XPATH = etree.XPath(f".//div[{has_class('job-description')}]")
+LINKEDIN_CARD_XPATH = etree.XPath(f"//ul[{has_class('jobs-search__results-list')}]/li")
+LINKEDIN_TITLE_XPATH = etree.XPath(f".//h3[{has_class('base-search-card__title')}]")
+LINKEDIN_COMPANY_XPATH = etree.XPath(f".//h4[{has_class('base-search-card__subtitle')}]")
+LINKEDIN_LINK_XPATH = etree.XPath(f".//a[{has_class('base-card__full-link')}]")
+LINKEDIN_POSTED_DATE_XPATH = etree.XPath(
+    f".//time[{has_class('job-search-card__listdate--new')} or {has_class('job-search-card__listdate')}]"
+)
+
 # --- Flask Web Server to Keep Service Alive ---
 app = Flask(__name__)
 
@@ -55,114 +89,218 @@ def run_web_server():
     app.run(host='0.0.0.0', port=port)
 
 # --- Helper Functions ---
-def setup_driver():
-    """Sets up and returns a headless Selenium WebDriver."""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36")
-    
+# Playwright browser shared across cycles, launched on the first fallback scrape
+playwright_instance = None
+browser = None
+browser_context = None
+
+async def block_resource(route):
+    """Aborts requests for resources the scrapers never read."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def get_browser_context():
+    """Returns the shared headless Chromium context, launching the browser if needed."""
+    global playwright_instance, browser, browser_context
+    if browser is not None and not browser.is_connected():
+        logging.warning("Browser disconnected. It will be relaunched.")
+        await close_browser()
+
+    if browser_context is None:
+        try:
+            playwright_instance = await async_playwright().start()
+            browser = await playwright_instance.chromium.launch(headless=True)
+            browser_context = await browser.new_context(user_agent=USER_AGENT)
+            # Only the DOM is scraped, so skip downloading images, fonts and stylesheets
+            await browser_context.route("**/*", block_resource)
+        except Exception as e:
+            logging.error(f"Failed to launch browser: {e}")
+            await close_browser()
+    return browser_context
+
+async def close_browser():
+    """Closes the shared browser and stops Playwright."""
+    global playwright_instance, browser, browser_context
+    # Each step is attempted on its own so a dead browser cannot leak the Playwright driver process
+    if browser is not None:
+        try:
+            await browser.close()
+        except Exception as e:
+            logging.warning(f"Error while closing browser: {e}")
+    if playwright_instance is not None:
+        try:
+            await playwright_instance.stop()
+        except Exception as e:
+            logging.warning(f"Error while stopping Playwright: {e}")
+    playwright_instance = browser = browser_context = None
+
+async def get_outer_html(page, css_selector):
+    """Returns the concatenated outer HTML of the elements matching a CSS selector."""
+    return await page.eval_on_selector_all(css_selector, "els => els.map(el => el.outerHTML).join('')")
+
+async def wait_for_new_cards(page, prev_count, timeout=5, interval=0.2):
+    """Polls until the LinkedIn results list grows past prev_count. Returns the latest card count."""
     try:
-        driver = webdriver.Chrome(options=chrome_options)
-        return driver
-    except Exception as e:
-        logging.error(f"Failed to set up WebDriver: {e}")
-        return None
+        await page.wait_for_function(
+            "([selector, prevCount]) => document.querySelectorAll(selector).length > prevCount",
+            arg=[LINKEDIN_CARD_SELECTOR, prev_count], timeout=timeout * 1000, polling=interval * 1000
+        )
+    except PlaywrightTimeoutError:
+        return prev_count
+    return await page.locator(LINKEDIN_CARD_SELECTOR).count()
+
+def first_match(xpath, node):
+    """Returns the first element matched by a compiled XPath, or None."""
+    matches = xpath(node)
+    return matches[0] if matches else None
 
-def get_job_hash(job_title, company_name):
+def get_job_hash(job_title, company_name, _blake2b=hashlib.blake2b):
     """Generates a unique and consistent hash for a job posting."""
-    return hashlib.md5(f"{job_title.strip()}-{company_name.strip()}".lower().encode()).hexdigest()
+    return _blake2b(f"{job_title.strip()}-{company_name.strip()}".lower().encode(), digest_size=16).hexdigest()
+
+def open_job_cache():
+    """Opens the SQLite job cache, creating its table and timestamp index if needed."""
+    conn = sqlite3.connect(JOB_CACHE_FILE)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS seen (hash TEXT PRIMARY KEY, ts REAL)")
+    conn.execute("CREATE INDEX IF NOT EXISTS seen_ts ON seen (ts)")
+    return conn
 
 def load_job_cache():
-    """Loads and cleans the job cache from the JSON file."""
-    if not os.path.exists(JOB_CACHE_FILE):
-        return {}
+    """Evicts expired entries from the job cache and returns the set of remaining job hashes."""
+    cutoff_time = datetime.now() - timedelta(hours=CACHE_RETENTION_HOURS)
     try:
-        with open(JOB_CACHE_FILE, "r") as f:
-            cache_data = json.load(f)
-            cutoff_time = datetime.now() - timedelta(hours=CACHE_RETENTION_HOURS)
-            fresh_cache = {
-                job_hash: timestamp
-                for job_hash, timestamp in cache_data.items()
-                if datetime.fromisoformat(timestamp) > cutoff_time
-            }
-            return fresh_cache
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {}
-
-def save_job_cache(cache):
-    """Saves the updated job cache to the JSON file."""
-    with open(JOB_CACHE_FILE, "w") as f:
-        json.dump(cache, f, indent=4)
+        with closing(open_job_cache()) as conn, conn:
+            conn.execute("DELETE FROM seen WHERE ts < ?", (cutoff_time.timestamp(),))
+            return {job_hash for (job_hash,) in conn.execute("SELECT hash FROM seen")}
+    except sqlite3.DatabaseError as e:
+        logging.error(f"Failed to load job cache: {e}")
+        return set()
+
+def save_job_cache(new_entries):
+    """Inserts newly cached jobs, given as a mapping of job hash to epoch timestamp."""
+    with closing(open_job_cache()) as conn, conn:
+        conn.executemany("INSERT OR IGNORE INTO seen (hash, ts) VALUES (?, ?)", new_entries.items())
+
+def compile_keyword_pattern(keywords):
+    """Compiles keywords into one alternation that is scanned in a single pass over lower-cased text."""
+    # Lower-casing the text and matching case-sensitively is several times faster than re.IGNORECASE
+    return re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords))
+
+EXCLUSION_PATTERN = compile_keyword_pattern(EXCLUSION_KEYWORDS)
+INCLUSION_PATTERN = compile_keyword_pattern(INCLUSION_KEYWORDS)
 
 def filter_job(title, description):
     """Filters jobs based on inclusion and exclusion keywords."""
     full_text = (title + " " + description).lower()
     
-    if any(keyword in full_text for keyword in EXCLUSION_KEYWORDS):
+    if EXCLUSION_PATTERN.search(full_text):
         return False
         
-    if any(keyword in full_text for keyword in INCLUSION_KEYWORDS):
-        return True
-        
-    return False
+    return bool(INCLUSION_PATTERN.search(full_text))
+
+async def send_telegram_notification(job, bot):
+    """Sends a formatted job notification asynchronously through a shared bot. Returns the notification outcome."""
+    message = (
+        f"<b>{escape(job['title'])}</b>\n"
+        f"<i>{escape(job['company'])}</i>\n\n"
+        f"<b>Source:</b> {escape(job['source'])}\n"
+        f"<b>Posted:</b> {escape(job['posted_date'])}\n\n"
+        f"<a href='{escape(job['link'])}'>➡️ Apply Now</a>"
+    )
+    for attempt in range(1, TELEGRAM_MAX_SEND_ATTEMPTS + 1):
+        try:
+            await bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message, parse_mode='HTML')
+            logging.info(f"Notification sent for: {job['title']}")
+            return NOTIFICATION_SENT
+        except telegram.error.RetryAfter as e:
+            if attempt == TELEGRAM_MAX_SEND_ATTEMPTS:
+                logging.error(f"Telegram kept throttling the notification for: {job['title']}. Will retry next cycle.")
+                return NOTIFICATION_FAILED
+            # Telegram throttled the chat; wait as instructed and try again
+            retry_after = e.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            logging.warning(f"Telegram rate limit hit. Retrying in {retry_after} seconds...")
+            await asyncio.sleep(retry_after)
+        except telegram.error.BadRequest as e:
+            logging.error(f"Telegram BadRequest Error (check Chat ID format for channels vs. private): {e}")
+            return NOTIFICATION_REJECTED
+        except telegram.error.NetworkError as e:
+            logging.error(f"Network error sending Telegram notification. Will retry next cycle: {e}")
+            return NOTIFICATION_FAILED
+        except Exception as e:
+            logging.error(f"Error sending Telegram notification: {e}")
+            return NOTIFICATION_REJECTED
 
-async def send_telegram_notification(job):
-    """Sends a formatted job notification asynchronously."""
-    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
-        logging.warning("Telegram credentials not set. Skipping notification.")
-        return
-        
-    try:
-        bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN)
-        message = (
-            f"<b>{job['title']}</b>\n"
-            f"<i>{job['company']}</i>\n\n"
-            f"<b>Source:</b> {job['source']}\n"
-            f"<b>Posted:</b> {job['posted_date']}\n\n"
-            f"<a href='{job['link']}'>➡️ Apply Now</a>"
-        )
-        await bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message, parse_mode='HTML')
-        logging.info(f"Notification sent for: {job['title']}")
-    except telegram.error.BadRequest as e:
-        logging.error(f"Telegram BadRequest Error (check Chat ID format for channels vs. private): {e}")
-    except Exception as e:
-        logging.error(f"Error sending Telegram notification: {e}")
+async def send_telegram_notifications(jobs):
+    """Sends notifications for a mapping of job hash to job, paced for a single chat.
 
-# --- Scraper Functions ---
-def scrape_naukri_jobs(driver):
-    """Scrapes job listings from Naukri.com with robust selectors."""
-    logging.info("Scraping Naukri.com...")
+    Returns a mapping of job hash to notification outcome.
+    """
+    if not jobs:
+        return {}
+
+    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+        logging.warning("Telegram credentials not set. Skipping notifications.")
+        return dict.fromkeys(jobs, NOTIFICATION_SKIPPED)
+
+    outcomes = {}
+    loop = asyncio.get_running_loop()
+    next_send_time = loop.time()
+    async with telegram.Bot(token=TELEGRAM_BOT_TOKEN) as bot:
+        for job_hash, job in jobs.items():
+            # All messages go to one chat, so they are sent one at a time at Telegram's per-chat pace
+            await asyncio.sleep(max(0, next_send_time - loop.time()))
+            outcomes[job_hash] = await send_telegram_notification(job, bot)
+            next_send_time = loop.time() + TELEGRAM_SEND_INTERVAL
+    return outcomes
+
+# --- Parser Functions ---
+def reject_job(title):
+    """Logs a job rejected while parsing because it contains an exclusion keyword."""
+    logging.info(f"Filtered out job: '{title}' due to keyword mismatch.")
+
+def parse_naukri_html(html):
+    """Extracts job listings from Naukri.com HTML. Returns the jobs and the number rejected while parsing."""
     jobs = []
+    rejected_count = 0
+    if not html:
+        return jobs, rejected_count
+
     try:
-        driver.get(NAUKRI_URL)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "article.jobTuple"))
-        )
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        job_cards = soup.select('article.jobTuple')
+        job_cards = NAUKRI_CARD_XPATH(lxml_html.fromstring(html))
 
         logging.info(f"Found {len(job_cards)} job cards on Naukri.")
         
         for card in job_cards:
-            title_elem = card.select_one('a.title')
-            company_elem = card.select_one('a.subTitle')
+            title_elem = first_match(NAUKRI_TITLE_XPATH, card)
+            company_elem = first_match(NAUKRI_COMPANY_XPATH, card)
             
-            if not title_elem or not company_elem:
+            if title_elem is None or company_elem is None or title_elem.get('href') is None:
                 continue
 
-            title = title_elem.text.strip()
-            company = company_elem.text.strip()
-            link = title_elem['href']
-            
-            posted_date_elem = card.select_one('span.postedDate')
-            posted_date = posted_date_elem.text.strip() if posted_date_elem else "Not specified"
+            # Reject on the title before reading the rest of the card
+            title = title_elem.text_content().strip()
+            if EXCLUSION_PATTERN.search(title.lower()):
+                reject_job(title)
+                rejected_count += 1
+                continue
+
+            description_elem = first_match(NAUKRI_DESCRIPTION_XPATH, card)
+            description = description_elem.text_content().strip() if description_elem is not None else ""
+            if EXCLUSION_PATTERN.search(description.lower()):
+                reject_job(title)
+                rejected_count += 1
+                continue
+
+            company = company_elem.text_content().strip()
+            link = title_elem.get('href')
             
-            description_elem = card.select_one('div.job-description')
-            description = description_elem.text.strip() if description_elem else ""
+            posted_date_elem = first_match(NAUKRI_POSTED_DATE_XPATH, card)
+            posted_date = posted_date_elem.text_content().strip() if posted_date_elem is not None else "Not specified"
 
             jobs.append({
                 'title': title, 'company': company, 'link': link,
@@ -170,99 +308,202 @@ def scrape_naukri_jobs(driver):
                 'description': description
             })
     except Exception as e:
-        logging.error(f"Error scraping Naukri: {e}", exc_info=True)
-    return jobs
+        logging.error(f"Error parsing Naukri: {e}", exc_info=True)
+    return jobs, rejected_count
 
-def scrape_linkedin_jobs(driver):
-    """Scrapes job listings from LinkedIn Jobs with robust selectors."""
-    logging.info("Scraping LinkedIn Jobs...")
+def parse_linkedin_html(html):
+    """Extracts job listings from LinkedIn Jobs HTML. Returns the jobs and the number rejected while parsing."""
     jobs = []
-    try:
-        driver.get(LINKEDIN_URL)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.jobs-search__results-list"))
-        )
-        
-        for _ in range(2):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
+    rejected_count = 0
+    if not html:
+        return jobs, rejected_count
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        job_cards = soup.select('ul.jobs-search__results-list > li')
+    try:
+        job_cards = LINKEDIN_CARD_XPATH(lxml_html.fromstring(html))
 
         logging.info(f"Found {len(job_cards)} potential job items on LinkedIn.")
 
         for card in job_cards:
-            title_elem = card.select_one('h3.base-search-card__title')
-            company_elem = card.select_one('h4.base-search-card__subtitle')
-            link_elem = card.select_one('a.base-card__full-link')
+            title_elem = first_match(LINKEDIN_TITLE_XPATH, card)
+            company_elem = first_match(LINKEDIN_COMPANY_XPATH, card)
+            link_elem = first_match(LINKEDIN_LINK_XPATH, card)
             
-            if not title_elem or not company_elem or not link_elem:
+            if title_elem is None or company_elem is None or link_elem is None or link_elem.get('href') is None:
                 continue
                 
-            title = title_elem.text.strip()
-            company = company_elem.text.strip()
-            link = link_elem['href']
+            # LinkedIn cards have no description, so the title is all the filter sees
+            title = title_elem.text_content().strip()
+            if EXCLUSION_PATTERN.search(title.lower()):
+                reject_job(title)
+                rejected_count += 1
+                continue
+
+            company = company_elem.text_content().strip()
+            link = link_elem.get('href')
             
-            posted_date_elem = card.select_one('time.job-search-card__listdate--new, time.job-search-card__listdate')
-            posted_date = posted_date_elem.text.strip() if posted_date_elem else "Not specified"
+            posted_date_elem = first_match(LINKEDIN_POSTED_DATE_XPATH, card)
+            posted_date = posted_date_elem.text_content().strip() if posted_date_elem is not None else "Not specified"
 
             jobs.append({
                 'title': title, 'company': company, 'link': link,
                 'posted_date': posted_date, 'source': 'LinkedIn',
                 'description': title
             })
+    except Exception as e:
+        logging.error(f"Error parsing LinkedIn: {e}", exc_info=True)
+    return jobs, rejected_count
+
+# --- Scraper Functions ---
+async def fetch_html(client, url):
+    """Fetches a page over plain HTTP. Returns an empty string on failure."""
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.text
+    except httpx.HTTPError as e:
+        logging.error(f"Error fetching {url}: {e}")
+        return ""
+
+async def fetch_all_jobs():
+    """Fetches and parses both job boards concurrently over plain HTTP."""
+    logging.info("Fetching Naukri.com and LinkedIn Jobs over HTTP...")
+    async with httpx.AsyncClient(
+        http2=True, headers={"User-Agent": USER_AGENT}, follow_redirects=True, timeout=20
+    ) as client:
+        naukri_html, linkedin_html = await asyncio.gather(
+            fetch_html(client, NAUKRI_URL), fetch_html(client, LINKEDIN_URL)
+        )
+    return {
+        scrape_naukri_jobs: parse_naukri_html(naukri_html),
+        scrape_linkedin_jobs: parse_linkedin_html(linkedin_html),
+    }
+
+async def scrape_naukri_jobs(context):
+    """Scrapes job listings from Naukri.com in a browser tab, for when plain HTTP fails."""
+    logging.info("Scraping Naukri.com...")
+    page = await context.new_page()
+    try:
+        await page.goto(NAUKRI_URL)
+        await page.wait_for_selector(NAUKRI_CARD_SELECTOR, timeout=20000)
+        
+        # Only the job cards are handed to the parser, not the whole page
+        return parse_naukri_html(await get_outer_html(page, NAUKRI_CARD_SELECTOR))
+    except Exception as e:
+        logging.error(f"Error scraping Naukri: {e}", exc_info=True)
+    finally:
+        await page.close()
+    return [], 0
+
+async def scrape_linkedin_jobs(context):
+    """Scrapes job listings from LinkedIn Jobs in a browser tab, for when plain HTTP fails."""
+    logging.info("Scraping LinkedIn Jobs...")
+    page = await context.new_page()
+    try:
+        await page.goto(LINKEDIN_URL)
+        await page.wait_for_selector(LINKEDIN_RESULTS_SELECTOR, timeout=20000)
+        
+        card_count = await page.locator(LINKEDIN_CARD_SELECTOR).count()
+        for _ in range(2):
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+            new_card_count = await wait_for_new_cards(page, card_count)
+            if new_card_count == card_count:
+                break  # The results list stopped growing, so there is nothing more to load
+            card_count = new_card_count
+
+        # Only the results list is handed to the parser, not the whole page
+        return parse_linkedin_html(await get_outer_html(page, LINKEDIN_RESULTS_SELECTOR))
     except Exception as e:
         logging.error(f"Error scraping LinkedIn: {e}", exc_info=True)
-    return jobs
+    finally:
+        await page.close()
+    return [], 0
 
 # --- Main Application Logic ---
 async def main_bot_logic():
     """Main function to orchestrate the job scraping and notification process."""
-    driver = setup_driver()
-    if not driver:
-        logging.error("Driver setup failed. Aborting this cycle.")
-        return
-
     try:
         job_cache = load_job_cache()
+        new_cache_entries = {}
         
         logging.info("Starting new job search cycle...")
 
-        all_jobs = scrape_naukri_jobs(driver) + scrape_linkedin_jobs(driver)
+        results = await fetch_all_jobs()
+
+        # Fall back to a real browser only for sites whose plain HTML yielded no job cards at all
+        fallback_scrapers = [
+            scraper for scraper, (jobs, rejected_count) in results.items() if not jobs and not rejected_count
+        ]
+        if fallback_scrapers:
+            logging.info(f"Falling back to a headless browser for: {', '.join(s.__name__ for s in fallback_scrapers)}")
+            context = await get_browser_context()
+            if context:
+                # Each site loads in its own tab of the shared context, concurrently
+                results.update(zip(
+                    fallback_scrapers,
+                    await asyncio.gather(*(scraper(context) for scraper in fallback_scrapers))
+                ))
+                await context.clear_cookies()
+
+        # Cards rejected while parsing count as filtered out
+        all_jobs = [job for jobs, _ in results.values() for job in jobs]
+        filtered_out_count = sum(rejected_count for _, rejected_count in results.values())
+        scraped_count = len(all_jobs) + filtered_out_count
         
-        logging.info(f"Total jobs scraped before filtering: {len(all_jobs)}")
+        logging.info(f"Total jobs scraped before filtering: {scraped_count}")
 
-        new_notification_count = 0
-        filtered_out_count = 0
+        pending_jobs = {}
+        now = datetime.now
         
         for job in all_jobs:
+            # Filter first so rejected jobs are never hashed
+            if not filter_job(job['title'], job['description']):
+                logging.info(f"Filtered out job: '{job['title']}' due to keyword mismatch.")
+                filtered_out_count += 1
+                continue
+
             job_hash = get_job_hash(job['title'], job['company'])
 
             if job_hash in job_cache:
                 continue
             
-            if filter_job(job['title'], job['description']):
-                await send_telegram_notification(job)
-                job_cache[job_hash] = datetime.now().isoformat()
-                new_notification_count += 1
-                await asyncio.sleep(1) # Asynchronous sleep
-            else:
-                logging.info(f"Filtered out job: '{job['title']}' due to keyword mismatch.")
-                filtered_out_count += 1
+            pending_jobs[job_hash] = job
+            job_cache.add(job_hash)
         
+        # Jobs whose notification failed transiently stay out of the cache and are retried next cycle
+        outcomes = await send_telegram_notifications(pending_jobs)
+        for job_hash, outcome in outcomes.items():
+            if outcome != NOTIFICATION_FAILED:
+                new_cache_entries[job_hash] = now().timestamp()
+        new_notification_count = sum(outcome == NOTIFICATION_SENT for outcome in outcomes.values())
+        failed_notification_count = sum(outcome == NOTIFICATION_FAILED for outcome in outcomes.values())
+
         logging.info(f"New notifications sent: {new_notification_count}")
+        if failed_notification_count:
+            logging.warning(f"Notifications not delivered (will retry next cycle): {failed_notification_count}")
         logging.info(f"Jobs filtered out: {filtered_out_count}")
-        logging.info(f"Jobs already in cache (skipped): {len(all_jobs) - new_notification_count - filtered_out_count}")
+        logging.info(f"Jobs already in cache (skipped): {scraped_count - len(pending_jobs) - filtered_out_count}")
 
-        save_job_cache(job_cache)
+        # Only touch the cache file when this cycle actually added jobs
+        if new_cache_entries:
+            save_job_cache(new_cache_entries)
         logging.info("Job search cycle finished.")
 
     except Exception as e:
         logging.error(f"An error occurred in the main loop: {e}", exc_info=True)
+
+async def run_bot():
+    """Runs a job search cycle every 30 minutes on one event loop, so the browser outlives each cycle."""
+    try:
+        while True:
+            try:
+                await main_bot_logic()
+            except Exception as e:
+                logging.critical(f"A critical error occurred in the main execution loop: {e}", exc_info=True)
+
+            logging.info("Waiting for 30 minutes before the next run...")
+            await asyncio.sleep(30 * 60) # 30 minutes
     finally:
-        if driver:
-            driver.quit()
+        await close_browser()
 
 # --- Entry Point ---
 if __name__ == "__main__":
@@ -274,11 +515,4 @@ if __name__ == "__main__":
     logging.info("Web server started to keep the bot alive on Railway.")
 
     # Main loop to run the bot logic periodically
-    while True:
-        try:
-            asyncio.run(main_bot_logic())
-        except Exception as e:
-            logging.critical(f"A critical error occurred in the main execution loop: {e}", exc_info=True)
-
-        logging.info("Waiting for 30 minutes before the next run...")
-        time.sleep(30 * 60) # 30 minutes
+    asyncio.run(run_bot())
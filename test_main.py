@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+import telegram
+
+import main
+from main import get_job_hash, parse_linkedin_html, parse_naukri_html
+
+
+def naukri_card(title, company, closed=True):
+    card = f'<article class="jobTuple"><a class="title" href="/{company}">{title}</a><a class="subTitle">{company}</a>'
+    return card + "</article>" if closed else card
+
+
+def test_naukri_cards_are_parsed():
+    jobs, rejected_count = parse_naukri_html(naukri_card("Vue Developer", "Acme") + naukri_card("React Developer", "Foo"))
+
+    assert [(job["title"], job["company"], job["link"]) for job in jobs] == [
+        ("Vue Developer", "Acme", "/Acme"),
+        ("React Developer", "Foo", "/Foo"),
+    ]
+    assert rejected_count == 0
+
+
+def test_naukri_unclosed_card_does_not_swallow_the_next_one():
+    jobs, _ = parse_naukri_html(naukri_card("Vue Developer", "Acme", closed=False) + naukri_card("React Developer", "Foo"))
+
+    assert [job["company"] for job in jobs] == ["Acme", "Foo"]
+
+
+def test_naukri_card_with_excluded_keyword_is_rejected():
+    jobs, rejected_count = parse_naukri_html(naukri_card("Senior Vue Developer", "Acme") + naukri_card("Vue Developer", "Foo"))
+
+    assert [job["company"] for job in jobs] == ["Foo"]
+    assert rejected_count == 1
+
+
+def test_naukri_card_with_excluded_keyword_in_description_is_rejected():
+    card = (
+        '<article class="jobTuple"><a class="title" href="/Acme">Vue Developer</a><a class="subTitle">Acme</a>'
+        '<div class="job-description">Looking for 0-5 Years of experience</div></article>'
+    )
+    jobs, rejected_count = parse_naukri_html(card + naukri_card("Vue Developer", "Foo"))
+
+    assert [job["company"] for job in jobs] == ["Foo"]
+    assert rejected_count == 1
+
+
+def test_naukri_card_without_link_is_skipped():
+    card = '<article class="jobTuple"><a class="title">Vue Developer</a><a class="subTitle">Acme</a></article>'
+    jobs, rejected_count = parse_naukri_html(card + naukri_card("Vue Developer", "Foo"))
+
+    assert [job["link"] for job in jobs] == ["/Foo"]
+    assert rejected_count == 0
+
+
+def linkedin_card(title, company, href="https://example.com/job"):
+    link = f'<a class="base-card__full-link" href="{href}"></a>' if href else '<a class="base-card__full-link"></a>'
+    return (
+        f'<li><h3 class="base-search-card__title">{title}</h3>'
+        f'<h4 class="base-search-card__subtitle">{company}</h4>{link}</li>'
+    )
+
+
+def test_linkedin_cards_from_every_results_list_are_parsed():
+    html = (
+        f'<ul class="jobs-search__results-list">{linkedin_card("Vue Developer", "Acme")}</ul>'
+        f'<ul class="jobs-search__results-list">{linkedin_card("React Developer", "Foo")}</ul>'
+    )
+    jobs, _ = parse_linkedin_html(html)
+
+    assert [job["company"] for job in jobs] == ["Acme", "Foo"]
+
+
+def test_linkedin_card_without_href_is_skipped():
+    html = (
+        '<ul class="jobs-search__results-list">'
+        f'{linkedin_card("Vue Developer", "Acme", href=None)}{linkedin_card("Vue Developer", "Foo")}'
+        '</ul>'
+    )
+    jobs, _ = parse_linkedin_html(html)
+
+    assert [job["company"] for job in jobs] == ["Foo"]
+
+
+def test_linkedin_nested_list_items_are_not_cards():
+    html = (
+        '<ul class="jobs-search__results-list"><li>'
+        '<h3 class="base-search-card__title">Frontend Developer</h3>'
+        '<h4 class="base-search-card__subtitle">Acme</h4>'
+        '<a class="base-card__full-link" href="https://example.com/job"></a>'
+        '<ul><li>Remote</li></ul>'
+        '</li></ul>'
+    )
+    jobs, rejected_count = parse_linkedin_html(html)
+
+    assert [(job["title"], job["company"], job["link"]) for job in jobs] == [
+        ("Frontend Developer", "Acme", "https://example.com/job"),
+    ]
+    assert rejected_count == 0
+
+
+class FakeBot:
+    """Stands in for telegram.Bot, failing sends according to the job title."""
+
+    sent = []
+
+    def __init__(self, token):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def send_message(self, chat_id, text, parse_mode):
+        if "Rejected" in text:
+            raise telegram.error.BadRequest("Can't parse entities")
+        if "Offline" in text:
+            raise telegram.error.TimedOut()
+        if "Throttled" in text:
+            raise telegram.error.RetryAfter(0)
+        FakeBot.sent.append(text)
+
+
+def job(title):
+    return {
+        'title': title, 'company': "Acme", 'link': "/job?a=1&b=2",
+        'posted_date': "Today", 'source': "Naukri", 'description': "",
+    }
+
+
+@pytest.fixture
+def run_cycle(monkeypatch):
+    """Runs one bot cycle over the given jobs and returns the hashes passed to save_job_cache."""
+    saved = {}
+    FakeBot.sent = []
+    monkeypatch.setattr(main.telegram, "Bot", FakeBot)
+    monkeypatch.setattr(main, "TELEGRAM_BOT_TOKEN", "token")
+    monkeypatch.setattr(main, "TELEGRAM_CHAT_ID", "chat")
+    monkeypatch.setattr(main, "TELEGRAM_SEND_INTERVAL", 0)
+    monkeypatch.setattr(main, "load_job_cache", set)
+    monkeypatch.setattr(main, "save_job_cache", saved.update)
+
+    def run(jobs):
+        async def fetch_all_jobs():
+            return {main.scrape_naukri_jobs: (jobs, 0)}
+
+        monkeypatch.setattr(main, "fetch_all_jobs", fetch_all_jobs)
+        asyncio.run(main.main_bot_logic())
+        return set(saved)
+
+    return run
+
+
+def test_delivered_and_rejected_notifications_are_cached(run_cycle):
+    saved = run_cycle([job("Vue Developer"), job("Rejected Vue <Developer>")])
+
+    assert saved == {get_job_hash("Vue Developer", "Acme"), get_job_hash("Rejected Vue <Developer>", "Acme")}
+
+
+def test_transient_notification_failures_are_not_cached(run_cycle):
+    saved = run_cycle([job("Vue Developer"), job("Offline Vue Developer"), job("Throttled Vue Developer")])
+
+    assert saved == {get_job_hash("Vue Developer", "Acme")}
+
+
+def test_jobs_are_cached_when_telegram_credentials_are_missing(run_cycle, monkeypatch):
+    monkeypatch.setattr(main, "TELEGRAM_CHAT_ID", None)
+    saved = run_cycle([job("Vue Developer")])
+
+    assert saved == {get_job_hash("Vue Developer", "Acme")}
+    assert FakeBot.sent == []
+
+
+def test_notification_fields_are_html_escaped(run_cycle):
+    run_cycle([job("Vue <Developer> & Co")])
+
+    assert "Vue &lt;Developer&gt; &amp; Co" in FakeBot.sent[0]
+    assert "href='/job?a=1&amp;b=2'" in FakeBot.sent[0]